@@ -0,0 +1,40 @@
+"""
+Django settings for running the littlelemon test suite.
+
+Used by pytest (see pytest.ini) and by default for `manage.py test` (see manage.py).
+"""
+import importlib.util
+
+from .settings import *  # noqa: F401,F403
+from .settings import os, dj_database_url
+
+if 'TEST_DATABASE_URL' in os.environ:
+    # CI: Opt in to PostgreSQL so --reuse-db and isolation level tests apply.
+    # Never DATABASE_URL: that is the production database on Render.
+    DATABASES = {
+        'default': dj_database_url.parse(os.environ.get('TEST_DATABASE_URL'))
+    }
+else:
+    # Testing: Use SQLite in memory for speed
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        }
+    }
+
+# Keep connections open for the lifetime of each test worker instead of
+# reconnecting per request/TransactionTestCase flush
+DATABASES['default']['CONN_MAX_AGE'] = None
+
+# Fast hashing for test users; PBKDF2 dominates create_user()/login() otherwise
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+# Fail the run on N+1 query patterns in views (lazy loads inside loops).
+# nplusone comes from requirements-test.txt; skip the check when it isn't installed
+if importlib.util.find_spec('nplusone') is not None:
+    INSTALLED_APPS = INSTALLED_APPS + ['nplusone.ext.django']
+    MIDDLEWARE = ['nplusone.ext.django.NPlusOneMiddleware'] + MIDDLEWARE
+    NPLUSONE_RAISE = True
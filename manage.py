@@ -6,7 +6,9 @@ import sys
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'littlelemon.settings')
+    # `manage.py test` uses the same settings as pytest (see pytest.ini)
+    default_settings = 'littlelemon.test_settings' if sys.argv[1:2] == ['test'] else 'littlelemon.settings'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', default_settings)
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
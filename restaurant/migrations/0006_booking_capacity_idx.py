@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-15 23:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0005_booking_uniq_user_slot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['status', 'booking_date', 'no_of_guests'], name='booking_capacity_idx'),
+        ),
+    ]
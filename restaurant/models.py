@@ -39,7 +39,14 @@ class Booking(models.Model):
     class Meta:
         ordering = ['-booking_date']
         # Prevent duplicate bookings for same user at same time
-        unique_together = ['user', 'booking_date']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'booking_date'], name='uniq_user_slot'),
+        ]
+        indexes = [
+            # Covers the capacity helpers (status equality + booking_date range,
+            # SUM(no_of_guests)) so they can be answered from the index alone
+            models.Index(fields=['status', 'booking_date', 'no_of_guests'], name='booking_capacity_idx'),
+        ]
     
     def clean(self):
         """Validate booking constraints"""
@@ -57,13 +64,17 @@ class Booking(models.Model):
         super().save(*args, **kwargs)
     
     @staticmethod
-    def get_time_slot_capacity(booking_datetime):
-        """Get current capacity for a 2-hour time slot"""
+    def get_time_slot_window(booking_datetime):
+        """Return the (start, end) bounds of the 2-hour time slot containing booking_datetime"""
         from datetime import timedelta
         
-        # Define 2-hour time slot window
         slot_start = booking_datetime.replace(minute=0, second=0, microsecond=0)
-        slot_end = slot_start + timedelta(hours=2)
+        return slot_start, slot_start + timedelta(hours=2)
+    
+    @staticmethod
+    def get_time_slot_capacity(booking_datetime):
+        """Get current capacity for a 2-hour time slot"""
+        slot_start, slot_end = Booking.get_time_slot_window(booking_datetime)
         
         # Count existing confirmed bookings in this time slot
         existing_bookings = Booking.objects.filter(
@@ -76,6 +87,26 @@ class Booking(models.Model):
         
         return existing_bookings['total_guests'] or 0
     
+    @staticmethod
+    def get_time_slot_capacity_raw(booking_datetime):
+        """Get current capacity for a 2-hour time slot using raw SQL (bypasses the ORM)"""
+        from django.db import connection
+        
+        slot_start, slot_end = Booking.get_time_slot_window(booking_datetime)
+        
+        sql = (
+            f"SELECT COALESCE(SUM(no_of_guests), 0) FROM {Booking._meta.db_table} "
+            "WHERE booking_date >= %s AND booking_date < %s AND status = %s"
+        )
+        params = [
+            connection.ops.adapt_datetimefield_value(slot_start),
+            connection.ops.adapt_datetimefield_value(slot_end),
+            'confirmed',
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchone()[0]
+    
     @staticmethod
     def get_daily_capacity(booking_date):
         """Get current capacity for entire day"""
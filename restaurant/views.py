@@ -113,13 +113,18 @@ class MyBookingsView(LoginRequiredMixin, View):
     
     def get(self, request, *args, **kwargs):
         """Handle template requests for user's bookings"""            
-        # Get user's bookings and render template
-        my_bookings = Booking.objects.filter(user=request.user).order_by('-booking_date')
+        # Get user's bookings and render template; the template shows
+        # booking.user, so join it in rather than querying per booking
+        my_bookings = list(
+            Booking.objects.filter(user=request.user)
+            .select_related('user')
+            .order_by('-booking_date')
+        )
         
         from django.utils import timezone
         context = {
             'my_bookings': my_bookings,
-            'total_bookings': my_bookings.count(),
+            'total_bookings': len(my_bookings),
             'now': timezone.now(),
         }
         return render(request, 'my_bookings.html', context)
@@ -0,0 +1,35 @@
+"""
+Shared constants and helpers for the Little Lemon test suite
+"""
+import time
+
+from django.db import OperationalError
+from django.urls import reverse
+
+# Resolved once at import; reverse_lazy would re-walk the URLconf on every use
+HOME_URL = reverse('home')
+ABOUT_URL = reverse('about')
+MENU_URL = reverse('menu')
+BOOK_URL = reverse('book')
+MY_BOOKINGS_URL = reverse('my-bookings')
+REGISTER_URL = reverse('register')
+LOGIN_URL = reverse('login')
+LOGOUT_URL = reverse('logout')
+
+
+def retry_on_table_lock(fn, attempts=20, backoff=0.005):
+    """
+    Call fn(), retrying when SQLite reports a table lock.
+
+    The shared-cache in-memory test database raises "database table is
+    locked" immediately instead of waiting, so the loser of a genuine race
+    sleeps backoff * attempt seconds and tries again. Any other error, or
+    the last failed attempt, propagates.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return fn()
+        except OperationalError as e:
+            if 'locked' not in str(e) or attempt == attempts:
+                raise
+            time.sleep(backoff * attempt)
@@ -3,18 +3,50 @@ Concurrency Tests for Little Lemon Restaurant
 
 Tests for concurrent booking scenarios, race condition prevention, and database integrity.
 """
+import logging
 import threading
 import time
+from functools import wraps
 from django.test import TestCase, TransactionTestCase
 from django.contrib.auth.models import User
 from django.utils import timezone
-from django.db import transaction, IntegrityError
+from django.db import connection, transaction
 from datetime import timedelta
 from unittest.mock import patch
 import concurrent.futures
 
 from restaurant.models import Booking, RestaurantConfig
 from restaurant.serializers import BookingSerializer
+from tests.helpers import retry_on_table_lock
+
+logger = logging.getLogger(__name__)
+
+
+def with_isolation_level(level_name):
+    """
+    Run a TransactionTestCase method under the given PostgreSQL isolation level
+    (e.g. 'SERIALIZABLE'). Every connection opened during the test, including
+    the ones created by worker threads, picks up the level from OPTIONS.
+    Other backends are skipped: SQLite transactions are already serializable.
+    """
+    def decorator(test_func):
+        @wraps(test_func)
+        def wrapper(self, *args, **kwargs):
+            if connection.vendor != 'postgresql':
+                self.skipTest(f'{level_name} isolation level requires PostgreSQL')
+            
+            from django.db.backends.postgresql.psycopg_any import IsolationLevel
+            
+            options = {'isolation_level': IsolationLevel[level_name]}
+            with patch.dict(connection.settings_dict['OPTIONS'], options):
+                # Reconnect so the new isolation level takes effect
+                connection.close()
+                try:
+                    return test_func(self, *args, **kwargs)
+                finally:
+                    connection.close()
+        return wrapper
+    return decorator
 
 
 class ConcurrencyTestCase(TransactionTestCase):
@@ -89,9 +121,9 @@ class ConcurrencyTestCase(TransactionTestCase):
         self.assertEqual(successful_bookings, num_threads)
         self.assertEqual(len(results), num_threads)
         
-        print(f"Concurrent booking results: {results}")
+        logger.info("Concurrent booking results: %s", results)
         if exceptions:
-            print(f"Exceptions occurred: {exceptions}")
+            logger.info("Exceptions occurred: %s", exceptions)
     
     def test_capacity_limit_enforcement(self):
         """Test that capacity limits are enforced under concurrency"""
@@ -135,13 +167,22 @@ class ConcurrencyTestCase(TransactionTestCase):
         
         self.assertLessEqual(total_guests, self.config.max_time_slot_capacity)
         
-        print(f"Capacity limit test results: {results}")
-        print(f"Total guests booked: {total_guests}/{self.config.max_time_slot_capacity}")
+        logger.info("Capacity limit test results: %s", results)
+        logger.info("Total guests booked: %s/%s", total_guests, self.config.max_time_slot_capacity)
         if exceptions:
-            print(f"Exceptions: {exceptions}")
+            logger.info("Exceptions: %s", exceptions)
     
     def test_race_condition_prevention(self):
-        """Test prevention of race conditions in booking creation"""
+        """Test prevention of race conditions in booking creation (READ COMMITTED)"""
+        self._assert_race_condition_prevented()
+    
+    @with_isolation_level('SERIALIZABLE')
+    def test_race_condition_prevention_serializable(self):
+        """Test prevention of race conditions in booking creation (SERIALIZABLE)"""
+        self._assert_race_condition_prevented()
+    
+    def _assert_race_condition_prevented(self):
+        """Run competing capacity-check-then-book attempts and verify the limit holds"""
         race_results = []
         
         def race_booking_attempt(user_index):
@@ -195,50 +236,48 @@ class ConcurrencyTestCase(TransactionTestCase):
         # Should not exceed capacity even with race condition attempts
         self.assertLessEqual(total_guests, self.config.max_time_slot_capacity)
         
-        print(f"Race condition test results: {race_results}")
-        print(f"Final capacity: {total_guests}/{self.config.max_time_slot_capacity}")
+        logger.info("Race condition test results: %s", race_results)
+        logger.info("Final capacity: %s/%s", total_guests, self.config.max_time_slot_capacity)
     
     def test_unique_constraint_enforcement(self):
-        """Test that unique constraints are enforced under concurrency"""
+        """Test that uniq_user_slot keeps one row out of a batch of duplicates, visible from another connection"""
         user = self.users[0]
+        
+        # Submit 3 bookings for same user/datetime in a single INSERT;
+        # the database resolves the conflict server-side via uniq_user_slot
+        Booking.objects.bulk_create([
+            Booking(
+                user=user,
+                name=f'Duplicate Attempt {i}',
+                no_of_guests=2,
+                booking_date=self.test_datetime
+            )
+            for i in range(3)
+        ], ignore_conflicts=True)
+        
         constraint_results = []
         
-        def attempt_duplicate_booking(attempt_id):
-            """Try to create duplicate booking for same user/datetime"""
+        def verify_unique_invariant():
+            """Check from a separate connection that only one row survived"""
             try:
-                booking_data = {
-                    'name': f'Duplicate Attempt {attempt_id}',
-                    'no_of_guests': 2,
-                    'booking_date': self.test_datetime,
-                    'user': user
-                }
-                
-                booking = Booking.objects.create(**booking_data)
-                constraint_results.append(f'Created: {attempt_id}')
-                return booking
-                
-            except IntegrityError as e:
-                constraint_results.append(f'Integrity Error: {attempt_id}')
-                return None
-            except Exception as e:
-                constraint_results.append(f'Other Error {attempt_id}: {str(e)}')
-                return None
-        
-        # Try to create 3 bookings for same user/datetime concurrently
-        num_threads = 3
-        with concurrent.futures.ThreadPoolExecutor(max_workers=num_threads) as executor:
-            futures = [executor.submit(attempt_duplicate_booking, i) for i in range(num_threads)]
-            concurrent.futures.wait(futures)
+                constraint_results.append(Booking.objects.filter(
+                    user=user,
+                    booking_date=self.test_datetime
+                ).count())
+            finally:
+                # CONN_MAX_AGE=None would otherwise keep this thread's connection open
+                connection.close()
+        
+        verifier = threading.Thread(target=verify_unique_invariant)
+        verifier.start()
+        verifier.join()
         
         # Should only have 1 booking for this user/datetime
-        bookings_count = Booking.objects.filter(
-            user=user, 
-            booking_date=self.test_datetime
-        ).count()
-        
-        self.assertEqual(bookings_count, 1)
-        
-        print(f"Unique constraint test results: {constraint_results}")
+        self.assertEqual(constraint_results, [1])
+        self.assertEqual(
+            Booking.objects.filter(user=user, booking_date=self.test_datetime).count(),
+            1
+        )
     
     def test_daily_capacity_enforcement(self):
         """Test daily capacity limits with concurrent bookings"""
@@ -295,8 +334,8 @@ class ConcurrencyTestCase(TransactionTestCase):
         
         self.assertLessEqual(total_daily_guests, self.config.max_daily_capacity)
         
-        print(f"Daily capacity test results: {daily_results}")
-        print(f"Daily total: {total_daily_guests}/{self.config.max_daily_capacity}")
+        logger.info("Daily capacity test results: %s", daily_results)
+        logger.info("Daily total: %s/%s", total_daily_guests, self.config.max_daily_capacity)
 
 
 class AtomicTransactionTest(TestCase):
@@ -350,8 +389,11 @@ class AtomicTransactionTest(TestCase):
         self.assertEqual(updated_config.max_daily_capacity, 100)
 
 
-class PerformanceTest(TestCase):
-    """Test performance under concurrent load"""
+class PerformanceTest(TransactionTestCase):
+    """
+    Test performance under concurrent load
+    TransactionTestCase so worker threads see the committed fixtures
+    """
     
     def setUp(self):
         """Set up test data"""
@@ -376,33 +418,31 @@ class PerformanceTest(TestCase):
         def timed_booking_creation(user_index):
             """Create booking and measure time"""
             user_start = time.time()
-            try:
-                user = self.users[user_index]
-                future_date = timezone.now() + timedelta(days=5, hours=18)
-                
-                booking_data = {
-                    'name': f'Performance Test {user_index}',
-                    'no_of_guests': 2,
-                    'booking_date': future_date + timedelta(minutes=user_index * 5),  # Spread times
-                    'user': user
-                }
-                
+            user = self.users[user_index]
+            future_date = timezone.now() + timedelta(days=5, hours=18)
+            
+            booking_data = {
+                'name': f'Performance Test {user_index}',
+                'no_of_guests': 2,
+                'booking_date': future_date + timedelta(minutes=user_index * 5),  # Spread times
+                'user': user
+            }
+            
+            def create():
                 with transaction.atomic():
+                    # Bound serializers hold per-request state, so each attempt
+                    # builds its own; a shared instance isn't thread-safe
                     serializer = BookingSerializer(data=booking_data)
-                    if serializer.is_valid():
-                        booking = serializer.save(user=user)
-                        user_end = time.time()
-                        performance_results.append(user_end - user_start)
-                        return True
-                    else:
-                        user_end = time.time()
-                        performance_results.append(user_end - user_start)
+                    if not serializer.is_valid():
                         return False
-                        
-            except Exception as e:
-                user_end = time.time()
-                performance_results.append(user_end - user_start)
-                return False
+                    serializer.save(user=user)
+                return True
+            
+            try:
+                return retry_on_table_lock(create)
+            finally:
+                performance_results.append(time.time() - user_start)
+                connection.close()
         
         # Create 10 concurrent bookings
         num_threads = 10
@@ -410,6 +450,10 @@ class PerformanceTest(TestCase):
             futures = [executor.submit(timed_booking_creation, i) for i in range(num_threads)]
             concurrent.futures.wait(futures)
         
+        # Every thread must actually have created its booking
+        self.assertTrue(all(f.result() for f in futures))
+        self.assertEqual(Booking.objects.filter(name__startswith='Performance Test').count(), num_threads)
+        
         end_time = time.time()
         total_time = end_time - start_time
         
@@ -419,7 +463,7 @@ class PerformanceTest(TestCase):
         if performance_results:
             avg_time = sum(performance_results) / len(performance_results)
             max_time = max(performance_results)
-            print(f"Performance results - Total: {total_time:.2f}s, Avg: {avg_time:.3f}s, Max: {max_time:.3f}s")
+            logger.info("Performance results - Total: %.2fs, Avg: %.3fs, Max: %.3fs", total_time, avg_time, max_time)
             
             # Individual booking should complete quickly
             self.assertLess(avg_time, 1.0)  # Average under 1 second
@@ -427,16 +471,18 @@ class PerformanceTest(TestCase):
     
     def test_capacity_calculation_performance(self):
         """Test performance of capacity calculation methods"""
-        # Create multiple bookings first
+        # Create multiple bookings first (single multi-row INSERT)
         test_date = timezone.now() + timedelta(days=3)
         
-        for i in range(10):
-            Booking.objects.create(
+        Booking.objects.bulk_create([
+            Booking(
                 user=self.users[i],
                 name=f'Capacity Test {i}',
                 no_of_guests=2,
                 booking_date=test_date + timedelta(minutes=i * 10)
             )
+            for i in range(10)
+        ])
         
         # Test time slot capacity calculation performance
         start_time = time.time()
@@ -447,6 +493,19 @@ class PerformanceTest(TestCase):
         time_slot_time = end_time - start_time
         self.assertLess(time_slot_time, 1.0)  # Should complete 100 calls in under 1 second
         
+        # Raw SQL variant must agree with the ORM; timed the same way (no query capture)
+        self.assertEqual(Booking.get_time_slot_capacity_raw(test_date), capacity)
+        start_time = time.time()
+        for _ in range(100):
+            raw_capacity = Booking.get_time_slot_capacity_raw(test_date)
+        end_time = time.time()
+        
+        raw_time_slot_time = end_time - start_time
+        if connection.vendor == 'sqlite':
+            # In-process SQLite exposes ORM overhead; on a networked backend the
+            # round-trip dominates both loops and the ratio is meaningless
+            self.assertLessEqual(raw_time_slot_time * 3, time_slot_time)
+        
         # Test daily capacity calculation performance
         start_time = time.time()
         for _ in range(100):
@@ -456,7 +515,16 @@ class PerformanceTest(TestCase):
         daily_time = end_time - start_time
         self.assertLess(daily_time, 1.0)  # Should complete 100 calls in under 1 second
         
-        print(f"Capacity calculation performance - Time slot: {time_slot_time:.3f}s, Daily: {daily_time:.3f}s")
+        # One aggregate query per call, checked outside the timed loops
+        with self.assertNumQueries(1):
+            Booking.get_time_slot_capacity(test_date)
+        with self.assertNumQueries(1):
+            Booking.get_daily_capacity(test_date.date())
+        
+        logger.info(
+            "Capacity calculation performance - Time slot: %.3fs, Raw time slot: %.3fs, Daily: %.3fs",
+            time_slot_time, raw_time_slot_time, daily_time
+        )
 
 
 class DatabaseIntegrityTest(TransactionTestCase):
@@ -476,7 +544,16 @@ class DatabaseIntegrityTest(TransactionTestCase):
         )
     
     def test_database_consistency(self):
-        """Test that database remains consistent under concurrent operations"""
+        """Test that database remains consistent under concurrent operations (READ COMMITTED)"""
+        self._assert_database_consistency()
+    
+    @with_isolation_level('SERIALIZABLE')
+    def test_database_consistency_serializable(self):
+        """Test that database remains consistent under concurrent operations (SERIALIZABLE)"""
+        self._assert_database_consistency()
+    
+    def _assert_database_consistency(self):
+        """Create competing bookings and verify capacity bookkeeping stays consistent"""
         test_datetime = timezone.now() + timedelta(days=4, hours=20)
         integrity_results = []
         
@@ -531,8 +608,8 @@ class DatabaseIntegrityTest(TransactionTestCase):
         self.assertEqual(calculated_capacity, actual_capacity, "Capacity calculation inconsistent with actual bookings")
         self.assertLessEqual(actual_capacity, self.config.max_time_slot_capacity, "Capacity limit exceeded")
         
-        print(f"Database integrity test results: {integrity_results}")
-        print(f"Final integrity check - Calculated: {calculated_capacity}, Actual: {actual_capacity}")
+        logger.info("Database integrity test results: %s", integrity_results)
+        logger.info("Final integrity check - Calculated: %s, Actual: %s", calculated_capacity, actual_capacity)
         
         # Check for consistency messages
         consistent_results = [r for r in integrity_results if 'Consistent' in r]
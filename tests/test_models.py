@@ -6,20 +6,42 @@ Tests for all Django models including validation, relationships, methods, and bu
 from django.test import TestCase
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q
 from django.utils import timezone
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 from decimal import Decimal
 
 from restaurant.models import Menu, Booking, RestaurantConfig
 
+# Field names (including reverse relations) resolved once for O(1) membership checks
+_BOOKING_FIELDS = frozenset(f.name for f in Booking._meta.get_fields())
+_MENU_FIELDS = frozenset(f.name for f in Menu._meta.get_fields())
+
+# One past the max_length (255) of Menu.title and Booking.name
+_LONG_STR_256 = "A" * 256
+
+
+def get_user_with_bookings(pk):
+    """Fetch a user with their bookings prefetched in one extra query"""
+    return User.objects.prefetch_related('bookings').get(pk=pk)
+
 
 class MenuModelTest(TestCase):
     """Test cases for Menu model"""
     
+    @classmethod
+    def setUpTestData(cls):
+        """Set up a persisted item once for the tests that hit the database"""
+        cls.menu_item = Menu.objects.create(
+            title="Greek Salad",
+            price=Decimal('12.99'),
+            inventory=50
+        )
+    
     def setUp(self):
-        """Set up test data"""
-        self.menu_item = Menu.objects.create(
+        """Attribute-only tests use an unsaved instance and skip the INSERT"""
+        self.menu_item_unsaved = Menu(
             title="Greek Salad",
             price=Decimal('12.99'),
             inventory=50
@@ -27,13 +49,14 @@ class MenuModelTest(TestCase):
     
     def test_menu_creation(self):
         """Test menu item creation"""
+        self.assertIsNotNone(self.menu_item.pk)
         self.assertEqual(self.menu_item.title, "Greek Salad")
         self.assertEqual(self.menu_item.price, Decimal('12.99'))
         self.assertEqual(self.menu_item.inventory, 50)
     
     def test_menu_string_representation(self):
         """Test __str__ method"""
-        self.assertEqual(str(self.menu_item), "Greek Salad - $12.99")
+        self.assertEqual(str(self.menu_item_unsaved), "Greek Salad - $12.99")
     
     def test_price_validation(self):
         """Test price field validation"""
@@ -53,20 +76,16 @@ class MenuModelTest(TestCase):
     
     def test_title_max_length(self):
         """Test title field max length"""
-        long_title = "A" * 256  # Exceeds max_length of 255
+        long_title = _LONG_STR_256
+        # Probe only the title validators instead of a model-wide full_clean()
         with self.assertRaises(ValidationError):
-            menu_item = Menu(title=long_title, price=Decimal('10.00'), inventory=10)
-            menu_item.full_clean()
+            Menu._meta.get_field('title').run_validators(long_title)
     
     def test_price_decimal_places(self):
         """Test price field decimal places"""
-        menu_item = Menu.objects.create(
-            title="Test Item",
-            price=Decimal('15.99'),  # Use correct decimal places
-            inventory=10
-        )
-        # Django will store exactly what we provide
-        self.assertEqual(menu_item.price, Decimal('15.99'))
+        # Read the row back so the assertion covers the stored value
+        stored_price = Menu.objects.values_list('price', flat=True).get(pk=self.menu_item.pk)
+        self.assertEqual(stored_price, Decimal('12.99'))
 
 
 class RestaurantConfigModelTest(TestCase):
@@ -128,27 +147,36 @@ class RestaurantConfigModelTest(TestCase):
 class BookingModelTest(TestCase):
     """Test cases for Booking model"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once for the entire test class"""
+        # Model tests never log in, so skip password hashing ('!' is unusable)
+        cls.user = User.objects.create(
             username='testuser',
             email='test@example.com',
-            password='testpass123'
+            password='!'
         )
         
-        self.config = RestaurantConfig.objects.create(
+        cls.user2, cls.user3, cls.user4, cls.user5 = User.objects.bulk_create([
+            User(username=f'user{i}', email=f'user{i}@example.com', password='!')
+            for i in range(2, 6)
+        ])
+        
+        cls.config = RestaurantConfig.objects.create(
             max_daily_capacity=50,
             max_time_slot_capacity=20,
             booking_advance_days=30
         )
         
-        self.future_date = timezone.now() + timedelta(days=7, hours=2)
+        # One clock snapshot per class; derive every offset from it
+        cls.NOW = timezone.now()
+        cls.FUTURE = cls.NOW + timedelta(days=7, hours=2)
         
-        self.booking = Booking.objects.create(
-            user=self.user,
+        cls.booking = Booking.objects.create(
+            user=cls.user,
             name="John Doe",
             no_of_guests=4,
-            booking_date=self.future_date,
+            booking_date=cls.FUTURE,
             status='confirmed'
         )
     
@@ -161,7 +189,7 @@ class BookingModelTest(TestCase):
     
     def test_booking_string_representation(self):
         """Test __str__ method"""
-        expected = f"John Doe - {self.future_date} (4 guests)"
+        expected = f"John Doe - {self.FUTURE} (4 guests)"
         self.assertEqual(str(self.booking), expected)
     
     def test_booking_auto_timestamps(self):
@@ -172,7 +200,9 @@ class BookingModelTest(TestCase):
         # Test updated_at changes on save
         original_updated = self.booking.updated_at
         self.booking.name = "Jane Doe"
-        self.booking.save()
+        # Single-field edits should list the auto_now column too, otherwise
+        # update_fields leaves updated_at stale in the database
+        self.booking.save(update_fields=['name', 'updated_at'])
         self.assertGreater(self.booking.updated_at, original_updated)
     
     def test_guest_count_validation(self):
@@ -183,7 +213,7 @@ class BookingModelTest(TestCase):
                 user=self.user,
                 name="Test User",
                 no_of_guests=0,
-                booking_date=self.future_date
+                booking_date=self.FUTURE
             )
             booking.full_clean()
         
@@ -193,14 +223,14 @@ class BookingModelTest(TestCase):
                 user=self.user,
                 name="Test User", 
                 no_of_guests=15,  # Assuming max is 10
-                booking_date=self.future_date
+                booking_date=self.FUTURE
             )
             booking.full_clean()
     
     def test_booking_date_validation(self):
         """Test booking date validation"""
         # Test past date
-        past_date = timezone.now() - timedelta(days=1)
+        past_date = self.NOW - timedelta(days=1)
         with self.assertRaises(ValidationError):
             booking = Booking(
                 user=self.user,
@@ -212,145 +242,158 @@ class BookingModelTest(TestCase):
     
     def test_unique_constraint(self):
         """Test unique constraint on user and booking_date"""
-        # Try to create another booking for same user and datetime
-        with self.assertRaises(IntegrityError):
+        # Try to create another booking for same user and datetime; the inner
+        # savepoint keeps the IntegrityError from poisoning the test transaction
+        with self.assertRaises(IntegrityError), transaction.atomic():
             Booking.objects.create(
                 user=self.user,
                 name="Another Booking",
                 no_of_guests=2,
-                booking_date=self.future_date
+                booking_date=self.FUTURE
             )
+        
+        # Transaction is still usable after the rolled-back savepoint
+        self.assertEqual(Booking.objects.filter(user=self.user).count(), 1)
     
     def test_status_choices(self):
         """Test status field choices"""
-        # Test valid status
-        self.booking.status = 'pending'
-        self.booking.save()
-        self.assertEqual(self.booking.status, 'pending')
+        # Check the choices with the field validator alone; no queries
+        status_field = Booking._meta.get_field('status')
+        with self.assertNumQueries(0):
+            self.assertEqual(status_field.clean('pending', self.booking), 'pending')
+            self.assertEqual(status_field.clean('cancelled', self.booking), 'cancelled')
         
+        # Persist only the final value with a single narrow UPDATE
         self.booking.status = 'cancelled'
-        self.booking.save()
+        with self.assertNumQueries(1):
+            self.booking.save(update_fields=['status'])
         self.assertEqual(self.booking.status, 'cancelled')
     
     def test_get_time_slot_capacity_method(self):
         """Test get_time_slot_capacity class method"""
         # Create additional bookings for the same time slot
-        same_time_slot = self.future_date.replace(minute=0, second=0, microsecond=0)
+        same_time_slot = self.FUTURE.replace(minute=0, second=0, microsecond=0)
         
         Booking.objects.create(
-            user=User.objects.create_user('user2', 'user2@example.com', 'pass'),
+            user=self.user2,
             name="User Two",
             no_of_guests=3,
             booking_date=same_time_slot + timedelta(minutes=30)
         )
         
-        capacity = Booking.get_time_slot_capacity(same_time_slot)
+        # Must stay a single DB-side SUM regardless of booking count
+        with self.assertNumQueries(1):
+            capacity = Booking.get_time_slot_capacity(same_time_slot)
         self.assertEqual(capacity, 7)  # 4 + 3 guests
     
     def test_get_daily_capacity_method(self):
         """Test get_daily_capacity class method"""
         # Create booking for same day but different time
-        same_day_different_time = self.future_date.replace(hour=20, minute=0, second=0, microsecond=0)
+        same_day_different_time = self.FUTURE.replace(hour=20, minute=0, second=0, microsecond=0)
         
         Booking.objects.create(
-            user=User.objects.create_user('user3', 'user3@example.com', 'pass'),
+            user=self.user3,
             name="User Three",
             no_of_guests=6,
             booking_date=same_day_different_time
         )
         
-        daily_capacity = Booking.get_daily_capacity(self.future_date.date())
+        # Must stay a single DB-side SUM regardless of booking count
+        with self.assertNumQueries(1):
+            daily_capacity = Booking.get_daily_capacity(self.FUTURE.date())
         self.assertEqual(daily_capacity, 10)  # 4 + 6 guests
     
     def test_booking_filtering_by_status(self):
         """Test filtering bookings by status"""
-        # Create bookings with different statuses
-        Booking.objects.create(
-            user=User.objects.create_user('user4', 'user4@example.com', 'pass'),
-            name="Pending User",
-            no_of_guests=2,
-            booking_date=self.future_date + timedelta(hours=2),
-            status='pending'
-        )
+        # Create bookings with different statuses (single multi-row INSERT)
+        Booking.objects.bulk_create([
+            Booking(
+                user=self.user4,
+                name="Pending User",
+                no_of_guests=2,
+                booking_date=self.FUTURE + timedelta(hours=2),
+                status='pending'
+            ),
+            Booking(
+                user=self.user5,
+                name="Cancelled User",
+                no_of_guests=3,
+                booking_date=self.FUTURE + timedelta(hours=3),
+                status='cancelled'
+            ),
+        ])
         
-        Booking.objects.create(
-            user=User.objects.create_user('user5', 'user5@example.com', 'pass'),
-            name="Cancelled User",
-            no_of_guests=3,
-            booking_date=self.future_date + timedelta(hours=3),
-            status='cancelled'
+        # Count every status in a single query
+        counts = Booking.objects.aggregate(
+            confirmed=Count('pk', filter=Q(status='confirmed')),
+            pending=Count('pk', filter=Q(status='pending')),
+            cancelled=Count('pk', filter=Q(status='cancelled')),
         )
         
-        confirmed_bookings = Booking.objects.filter(status='confirmed')
-        pending_bookings = Booking.objects.filter(status='pending')
-        cancelled_bookings = Booking.objects.filter(status='cancelled')
-        
-        self.assertEqual(confirmed_bookings.count(), 1)
-        self.assertEqual(pending_bookings.count(), 1)
-        self.assertEqual(cancelled_bookings.count(), 1)
+        self.assertEqual(counts['confirmed'], 1)
+        self.assertEqual(counts['pending'], 1)
+        self.assertEqual(counts['cancelled'], 1)
     
     def test_user_relationship(self):
         """Test user foreign key relationship"""
         self.assertEqual(self.booking.user, self.user)
         
-        # Test cascade delete using correct related_name
-        user_bookings = self.user.bookings.all()
-        self.assertEqual(user_bookings.count(), 1)
+        # Test reverse relation using correct related_name, eager-loaded the
+        # way views should fetch it (users + bookings IN (...), no N+1)
+        with self.assertNumQueries(2):
+            user = get_user_with_bookings(self.user.pk)
+            user_bookings = list(user.bookings.all())
+        self.assertEqual(len(user_bookings), 1)
         self.assertIn(self.booking, user_bookings)
 
 
 class ModelValidationTest(TestCase):
     """Test model validation and business rules"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once for the entire test class"""
+        # Model tests never log in, so skip password hashing ('!' is unusable)
+        cls.user = User.objects.create(
             username='validationuser',
             email='validation@example.com',
-            password='testpass123'
+            password='!'
         )
         
-        self.config = RestaurantConfig.objects.create(
+        cls.config = RestaurantConfig.objects.create(
             max_daily_capacity=50,
             max_time_slot_capacity=20,
             booking_advance_days=30
         )
+        
+        # One clock snapshot per class; derive every offset from it
+        cls.NOW = timezone.now()
+        cls.FUTURE = cls.NOW + timedelta(days=5)
+        
+        # Assuming business hours are 10 AM to 10 PM
+        tomorrow = (cls.NOW + timedelta(days=1)).date()
+        cls.EARLY = timezone.make_aware(datetime.combine(tomorrow, time(8, 0)))  # 8 AM
+        cls.LATE = timezone.make_aware(datetime.combine(tomorrow, time(23, 0)))  # 11 PM
     
     def test_name_field_validation(self):
         """Test booking name field validation"""
-        future_date = timezone.now() + timedelta(days=5)
+        name_field = Booking._meta.get_field('name')
         
-        # Test empty name
+        # Test empty name (run_validators skips empty values, so use the
+        # field's own clean() which also enforces blank=False)
         with self.assertRaises(ValidationError):
-            booking = Booking(
-                user=self.user,
-                name="",
-                no_of_guests=2,
-                booking_date=future_date
-            )
-            booking.full_clean()
+            name_field.clean("", None)
         
         # Test name too long
-        long_name = "A" * 256  # Exceeds max_length
+        long_name = _LONG_STR_256
         with self.assertRaises(ValidationError):
-            booking = Booking(
-                user=self.user,
-                name=long_name,
-                no_of_guests=2,
-                booking_date=future_date
-            )
-            booking.full_clean()
+            name_field.run_validators(long_name)
     
     def test_business_hours_validation(self):
         """Test booking within business hours"""
-        # Assuming business hours are 10 AM to 10 PM
-        today = timezone.now().date()
-        
-        # Test booking too early (8 AM)
-        early_time = timezone.make_aware(datetime.combine(today + timedelta(days=1), datetime.min.time().replace(hour=8)))
-        
-        # Test booking too late (11 PM) 
-        late_time = timezone.make_aware(datetime.combine(today + timedelta(days=1), datetime.min.time().replace(hour=23)))
+        # Test booking too early (8 AM) and too late (11 PM)
+        early_time = self.EARLY
+        late_time = self.LATE
         
         # These should be handled by serializer validation, but test model level
         booking_early = Booking(
@@ -377,23 +420,28 @@ class ModelValidationTest(TestCase):
         booking_meta = Booking._meta
         self.assertEqual(booking_meta.ordering, ['-booking_date'])
         
-        # Test unique_together constraint
-        self.assertIn(('user', 'booking_date'), booking_meta.unique_together)
+        # Test unique user/slot constraint
+        constraints = {c.name: c for c in booking_meta.constraints}
+        self.assertIn('uniq_user_slot', constraints)
+        self.assertEqual(constraints['uniq_user_slot'].fields, ('user', 'booking_date'))
+        
+        # Test covering index for capacity queries
+        indexes = {index.name: index for index in booking_meta.indexes}
+        self.assertIn('booking_capacity_idx', indexes)
+        self.assertEqual(indexes['booking_capacity_idx'].fields, ['status', 'booking_date', 'no_of_guests'])
     
     def test_model_field_properties(self):
         """Test model field properties"""
         # Test Menu model fields
-        menu_fields = [field.name for field in Menu._meta.fields]
-        self.assertIn('title', menu_fields)
-        self.assertIn('price', menu_fields)
-        self.assertIn('inventory', menu_fields)
+        self.assertIn('title', _MENU_FIELDS)
+        self.assertIn('price', _MENU_FIELDS)
+        self.assertIn('inventory', _MENU_FIELDS)
         
         # Test Booking model fields
-        booking_fields = [field.name for field in Booking._meta.fields]
-        self.assertIn('user', booking_fields)
-        self.assertIn('name', booking_fields)
-        self.assertIn('no_of_guests', booking_fields)
-        self.assertIn('booking_date', booking_fields)
-        self.assertIn('status', booking_fields)
-        self.assertIn('created_at', booking_fields)
-        self.assertIn('updated_at', booking_fields)
\ No newline at end of file
+        self.assertIn('user', _BOOKING_FIELDS)
+        self.assertIn('name', _BOOKING_FIELDS)
+        self.assertIn('no_of_guests', _BOOKING_FIELDS)
+        self.assertIn('booking_date', _BOOKING_FIELDS)
+        self.assertIn('status', _BOOKING_FIELDS)
+        self.assertIn('created_at', _BOOKING_FIELDS)
+        self.assertIn('updated_at', _BOOKING_FIELDS)
\ No newline at end of file
@@ -4,32 +4,41 @@ Test Runner and Test Documentation for Little Lemon Restaurant
 This file provides utilities and documentation for running the comprehensive test suite.
 """
 
+# All commands run with littlelemon.test_settings (in-memory SQLite, MD5
+# password hashing instead of PBKDF2, persistent connections).
+TEST_SETTINGS = '--settings=littlelemon.test_settings'
+
+# Fast test invocation: spread test classes across CPU cores.
+FAST_TEST = f'python manage.py test {TEST_SETTINGS} --parallel auto'
+
 # Test Categories and Commands
 TEST_COMMANDS = {
-    'all': 'python manage.py test',
-    'models': 'python manage.py test tests.test_models',
-    'views': 'python manage.py test tests.test_views', 
-    'api': 'python manage.py test tests.test_api',
-    'auth': 'python manage.py test tests.test_auth',
-    'concurrency': 'python manage.py test tests.test_concurrency',
-    'integration': 'python manage.py test tests.test_integration',
+    'all': FAST_TEST,
+    'models': f'{FAST_TEST} tests.test_models',
+    'views': f'{FAST_TEST} tests.test_views',
+    'api': f'{FAST_TEST} tests.test_api',
+    'auth': f'{FAST_TEST} tests.test_auth',
+    'concurrency': f'{FAST_TEST} tests.test_concurrency',
+    'integration': f'{FAST_TEST} tests.test_integration',
+    'pytest': 'pytest',  # Sharded across CPU cores via pytest-xdist (see pytest.ini)
+    'pytest_rebuild_db': 'pytest --create-db',  # Force a fresh test DB after migrations change
 }
 
 # Specific Test Classes
 SPECIFIC_TESTS = {
-    'menu_models': 'python manage.py test tests.test_models.MenuModelTest',
-    'booking_models': 'python manage.py test tests.test_models.BookingModelTest',
-    'login_views': 'python manage.py test tests.test_views.LoginViewTest',
-    'api_auth': 'python manage.py test tests.test_api.APIAuthenticationTest',
-    'concurrency_booking': 'python manage.py test tests.test_concurrency.ConcurrencyTestCase',
-    'user_workflow': 'python manage.py test tests.test_integration.CompleteUserWorkflowTest',
+    'menu_models': f'python manage.py test {TEST_SETTINGS} tests.test_models.MenuModelTest',
+    'booking_models': f'python manage.py test {TEST_SETTINGS} tests.test_models.BookingModelTest',
+    'login_views': f'python manage.py test {TEST_SETTINGS} tests.test_views.LoginViewTest',
+    'api_auth': f'python manage.py test {TEST_SETTINGS} tests.test_api.APIAuthenticationTest',
+    'concurrency_booking': f'python manage.py test {TEST_SETTINGS} tests.test_concurrency.ConcurrencyTestCase',
+    'user_workflow': f'python manage.py test {TEST_SETTINGS} tests.test_integration.CompleteUserWorkflowTest',
 }
 
 # Performance and Load Tests
 PERFORMANCE_TESTS = {
-    'concurrency_performance': 'python manage.py test tests.test_concurrency.PerformanceTest',
-    'integration_performance': 'python manage.py test tests.test_integration.PerformanceIntegrationTest',
-    'high_load': 'python manage.py test tests.test_integration.PerformanceIntegrationTest.test_high_load_scenario',
+    'concurrency_performance': f'{FAST_TEST} tests.test_concurrency.PerformanceTest',
+    'integration_performance': f'{FAST_TEST} tests.test_integration.PerformanceIntegrationTest',
+    'high_load': f'{FAST_TEST} tests.test_integration.PerformanceIntegrationTest.test_high_load_scenario',
 }
 
 def print_test_commands():
@@ -48,6 +57,10 @@ def print_test_commands():
     print("\n⚡ Performance Tests:")
     for name, command in PERFORMANCE_TESTS.items():
         print(f"  {name:20} : {command}")
+    
+    print("\nℹ️  With TEST_DATABASE_URL set to a file or server database, add --keepdb to reuse")
+    print("   the test database between runs (drop it after changing migrations).")
+    print("   It has no effect on the default in-memory SQLite database.")
 
 if __name__ == "__main__":
     print_test_commands()
\ No newline at end of file
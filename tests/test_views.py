@@ -3,59 +3,65 @@ View Tests for Little Lemon Restaurant
 
 Tests for all Django views including templates, forms, authentication, and user interactions.
 """
-from django.test import TestCase, Client
-from django.urls import reverse
+import logging
+
+from django.test import TestCase
 from django.contrib.auth.models import User
 from django.contrib.messages import get_messages
 from django.utils import timezone
 from datetime import timedelta
 
 from restaurant.models import Menu, Booking, RestaurantConfig
+from tests.helpers import (
+    HOME_URL, ABOUT_URL, MENU_URL, BOOK_URL, MY_BOOKINGS_URL,
+    REGISTER_URL, LOGIN_URL, LOGOUT_URL,
+)
+
+
+def assert_message_contains(test, response, fragment):
+    """Assert that one of the request's flash messages contains fragment"""
+    joined = '\n'.join(m.message for m in get_messages(response.wsgi_request))
+    test.assertIn(fragment, joined)
+
+
+def setUpModule():
+    """Silence django.request 4xx warnings and other log output for this module"""
+    logging.disable(logging.CRITICAL)
+
+
+def tearDownModule():
+    logging.disable(logging.NOTSET)
 
 
 class PublicViewsTest(TestCase):
     """Test public views accessible to all users"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = Client()
-    
-    def test_home_page_view(self):
-        """Test homepage view"""
-        response = self.client.get(reverse('home'))
-        self.assertEqual(response.status_code, 200)
-        self.assertContains(response, "Little Lemon")
-        self.assertTemplateUsed(response, 'index.html')
-    
-    def test_about_page_view(self):
-        """Test about page view"""
-        response = self.client.get(reverse('about'))
-        self.assertEqual(response.status_code, 200)
-        self.assertContains(response, "About")
-        self.assertTemplateUsed(response, 'about.html')
-    
-    def test_login_page_view(self):
-        """Test login page view"""
-        response = self.client.get(reverse('login'))
-        self.assertEqual(response.status_code, 200)
-        self.assertContains(response, "Login")
-        self.assertTemplateUsed(response, 'login.html')
-    
-    def test_register_page_view(self):
-        """Test register page view"""
-        response = self.client.get(reverse('register'))
-        self.assertEqual(response.status_code, 200)
-        self.assertContains(response, "Register")
-        self.assertTemplateUsed(response, 'register.html')
+    # (view name, url, expected fragment, template)
+    PUBLIC_PAGES = [
+        ('home', HOME_URL, "Little Lemon", 'index.html'),
+        ('about', ABOUT_URL, "About", 'about.html'),
+        ('login', LOGIN_URL, "Login", 'login.html'),
+        ('register', REGISTER_URL, "Register", 'register.html'),
+    ]
+    
+    def test_public_pages(self):
+        """Test homepage, about, login and register pages render for anonymous users"""
+        for name, url, needle, template in self.PUBLIC_PAGES:
+            with self.subTest(view=name):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, needle)
+                # The needles also appear in the shared header, so pin the template
+                self.assertTemplateUsed(response, template)
 
 
 class AuthenticatedViewsTest(TestCase):
     """Test views that require authentication"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = Client()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class"""
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123',
@@ -64,71 +70,71 @@ class AuthenticatedViewsTest(TestCase):
         )
         
         # Create some menu items
-        self.menu_items = [
-            Menu.objects.create(title="Greek Salad", price=12.99, inventory=20),
-            Menu.objects.create(title="Bruschetta", price=8.99, inventory=15),
-            Menu.objects.create(title="Grilled Salmon", price=18.99, inventory=10)
-        ]
+        cls.menu_items = Menu.objects.bulk_create([
+            Menu(title="Greek Salad", price=12.99, inventory=20),
+            Menu(title="Bruschetta", price=8.99, inventory=15),
+            Menu(title="Grilled Salmon", price=18.99, inventory=10)
+        ])
         
         # Create restaurant config
-        self.config = RestaurantConfig.objects.create(
+        cls.config = RestaurantConfig.objects.create(
             max_daily_capacity=50,
             max_time_slot_capacity=20,
             booking_advance_days=30
         )
+        
+        # Reference time shared by the class's booking fixtures
+        cls.NOW = timezone.now()
+        cls.FUTURE = cls.NOW + timedelta(days=7)
     
     def test_menu_view_requires_login(self):
         """Test menu view redirects unauthenticated users"""
-        response = self.client.get(reverse('menu'))
+        response = self.client.get(MENU_URL)
         self.assertEqual(response.status_code, 302)
-        self.assertRedirects(response, '/login/?next=/menu/')
+        self.assertRedirects(response, '/login/?next=/menu/', fetch_redirect_response=False)
     
     def test_menu_view_authenticated(self):
         """Test menu view for authenticated users"""
-        self.client.login(username='testuser', password='testpass123')
-        response = self.client.get(reverse('menu'))
+        self.client.force_login(self.user)
+        response = self.client.get(MENU_URL)
         self.assertEqual(response.status_code, 200)
-        self.assertTemplateUsed(response, 'menu.html')
         self.assertContains(response, "Greek Salad")
         self.assertContains(response, "Bruschetta")
         self.assertContains(response, "Grilled Salmon")
     
     def test_booking_view_requires_login(self):
         """Test booking view redirects unauthenticated users"""
-        response = self.client.get(reverse('book'))
+        response = self.client.get(BOOK_URL)
         self.assertEqual(response.status_code, 302)
-        self.assertRedirects(response, '/login/?next=/book/')
+        self.assertRedirects(response, '/login/?next=/book/', fetch_redirect_response=False)
     
     def test_booking_view_authenticated(self):
         """Test booking view for authenticated users"""
-        self.client.login(username='testuser', password='testpass123')
-        response = self.client.get(reverse('book'))
+        self.client.force_login(self.user)
+        response = self.client.get(BOOK_URL)
         self.assertEqual(response.status_code, 200)
-        self.assertTemplateUsed(response, 'book.html')
         self.assertContains(response, "Make a Reservation")
     
     def test_my_bookings_view_requires_login(self):
         """Test my bookings view redirects unauthenticated users"""
-        response = self.client.get(reverse('my-bookings'))
+        response = self.client.get(MY_BOOKINGS_URL)
         self.assertEqual(response.status_code, 302)
-        self.assertRedirects(response, '/login/?next=/my-bookings/')
+        self.assertRedirects(response, '/login/?next=/my-bookings/', fetch_redirect_response=False)
     
     def test_my_bookings_view_authenticated(self):
         """Test my bookings view for authenticated users"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Create a booking for the user
-        future_date = timezone.now() + timedelta(days=7)
         booking = Booking.objects.create(
             user=self.user,
             name="Test Booking",
             no_of_guests=4,
-            booking_date=future_date
+            booking_date=self.FUTURE
         )
         
-        response = self.client.get(reverse('my-bookings'))
+        response = self.client.get(MY_BOOKINGS_URL)
         self.assertEqual(response.status_code, 200)
-        self.assertTemplateUsed(response, 'my_bookings.html')
         self.assertContains(response, "Test Booking")
         self.assertContains(response, "4 guests")
 
@@ -136,10 +142,10 @@ class AuthenticatedViewsTest(TestCase):
 class LoginViewTest(TestCase):
     """Test login functionality"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = Client()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class"""
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123',
@@ -148,32 +154,31 @@ class LoginViewTest(TestCase):
     
     def test_login_get_request(self):
         """Test GET request to login page"""
-        response = self.client.get(reverse('login'))
+        response = self.client.get(LOGIN_URL)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'login.html')
     
     def test_valid_login(self):
         """Test login with valid credentials"""
-        response = self.client.post(reverse('login'), {
+        response = self.client.post(LOGIN_URL, {
             'username': 'testuser',
             'password': 'testpass123'
         })
         
         # Should redirect after successful login
         self.assertEqual(response.status_code, 302)
-        self.assertRedirects(response, reverse('home'))
+        self.assertRedirects(response, HOME_URL, fetch_redirect_response=False)
         
         # Check user is logged in
         user = response.wsgi_request.user
         self.assertTrue(user.is_authenticated)
         
         # Check success message
-        messages = list(get_messages(response.wsgi_request))
-        self.assertTrue(any('Welcome back' in str(msg) for msg in messages))
+        assert_message_contains(self, response, 'Welcome back')
     
     def test_invalid_login(self):
         """Test login with invalid credentials"""
-        response = self.client.post(reverse('login'), {
+        response = self.client.post(LOGIN_URL, {
             'username': 'testuser',
             'password': 'wrongpassword'
         })
@@ -183,37 +188,32 @@ class LoginViewTest(TestCase):
         self.assertTemplateUsed(response, 'login.html')
         
         # Check error message
-        messages = list(get_messages(response.wsgi_request))
-        self.assertTrue(any('Invalid username or password' in str(msg) for msg in messages))
+        assert_message_contains(self, response, 'Invalid username or password')
     
     def test_login_redirect_next(self):
         """Test login redirects to next parameter"""
-        next_url = reverse('menu')
-        response = self.client.post(f"{reverse('login')}?next={next_url}", {
+        next_url = MENU_URL
+        response = self.client.post(f"{LOGIN_URL}?next={next_url}", {
             'username': 'testuser',
             'password': 'testpass123'
         })
         
         self.assertEqual(response.status_code, 302)
-        self.assertRedirects(response, next_url)
+        self.assertRedirects(response, next_url, fetch_redirect_response=False)
 
 
 class RegisterViewTest(TestCase):
     """Test registration functionality"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = Client()
-    
     def test_register_get_request(self):
         """Test GET request to register page"""
-        response = self.client.get(reverse('register'))
+        response = self.client.get(REGISTER_URL)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'register.html')
     
     def test_valid_registration(self):
         """Test registration with valid data"""
-        response = self.client.post(reverse('register'), {
+        response = self.client.post(REGISTER_URL, {
             'username': 'newuser',
             'email': 'newuser@example.com',
             'password': 'newpass123',
@@ -223,7 +223,7 @@ class RegisterViewTest(TestCase):
         
         # Should redirect to login page
         self.assertEqual(response.status_code, 302)
-        self.assertRedirects(response, reverse('login'))
+        self.assertRedirects(response, LOGIN_URL, fetch_redirect_response=False)
         
         # Check user was created
         user = User.objects.get(username='newuser')
@@ -232,15 +232,14 @@ class RegisterViewTest(TestCase):
         self.assertEqual(user.last_name, 'User')
         
         # Check success message
-        messages = list(get_messages(response.wsgi_request))
-        self.assertTrue(any('Account created successfully' in str(msg) for msg in messages))
+        assert_message_contains(self, response, 'Account created successfully')
     
     def test_duplicate_username_registration(self):
         """Test registration with existing username"""
         # Create existing user
         User.objects.create_user('existinguser', 'existing@example.com', 'pass123')
         
-        response = self.client.post(reverse('register'), {
+        response = self.client.post(REGISTER_URL, {
             'username': 'existinguser',
             'email': 'different@example.com',
             'password': 'newpass123'
@@ -251,47 +250,50 @@ class RegisterViewTest(TestCase):
         self.assertTemplateUsed(response, 'register.html')
         
         # Check error message
-        messages = list(get_messages(response.wsgi_request))
-        self.assertTrue(any('Registration failed' in str(msg) for msg in messages))
+        assert_message_contains(self, response, 'Registration failed')
 
 
 class BookingViewTest(TestCase):
     """Test booking form functionality"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = Client()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class"""
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
         )
         
         # Create restaurant config
-        self.config = RestaurantConfig.objects.create(
+        cls.config = RestaurantConfig.objects.create(
             max_daily_capacity=50,
             max_time_slot_capacity=20,
             booking_advance_days=30
         )
         
-        self.client.login(username='testuser', password='testpass123')
+        # Reference times and their form-field renderings
+        cls.NOW = timezone.now()
+        cls.FUTURE = cls.NOW + timedelta(days=7)
+        cls.FUTURE_DATE_STR = cls.FUTURE.strftime('%Y-%m-%d')
+        cls.FUTURE_TIME_STR = cls.FUTURE.strftime('%H:%M')
+    
+    def setUp(self):
+        """Set up per-test state"""
+        self.client.force_login(self.user)
     
     def test_valid_booking_submission(self):
         """Test booking with valid data"""
-        future_date = timezone.now() + timedelta(days=7)
-        booking_date = future_date.strftime('%Y-%m-%d')
-        booking_time = future_date.strftime('%H:%M')
-        
-        response = self.client.post(reverse('book'), {
+        response = self.client.post(BOOK_URL, {
             'name': 'John Doe',
             'no_of_guests': '4',
-            'booking_date': booking_date,
-            'booking_time': booking_time
+            'booking_date': self.FUTURE_DATE_STR,
+            'booking_time': self.FUTURE_TIME_STR
         })
         
         # Should redirect back to booking page
         self.assertEqual(response.status_code, 302)
-        self.assertRedirects(response, reverse('book'))
+        self.assertRedirects(response, BOOK_URL, fetch_redirect_response=False)
         
         # Check booking was created
         booking = Booking.objects.get(user=self.user)
@@ -299,12 +301,11 @@ class BookingViewTest(TestCase):
         self.assertEqual(booking.no_of_guests, 4)
         
         # Check success message
-        messages = list(get_messages(response.wsgi_request))
-        self.assertTrue(any('reservation has been confirmed' in str(msg) for msg in messages))
+        assert_message_contains(self, response, 'reservation has been confirmed')
     
     def test_invalid_booking_date_format(self):
         """Test booking with invalid date format"""
-        response = self.client.post(reverse('book'), {
+        response = self.client.post(BOOK_URL, {
             'name': 'John Doe',
             'no_of_guests': '4',
             'booking_date': 'invalid-date',
@@ -313,19 +314,18 @@ class BookingViewTest(TestCase):
         
         # Should redirect back with error
         self.assertEqual(response.status_code, 302)
-        self.assertRedirects(response, reverse('book'))
+        self.assertRedirects(response, BOOK_URL, fetch_redirect_response=False)
         
         # Check error message
-        messages = list(get_messages(response.wsgi_request))
-        self.assertTrue(any('Invalid date or time format' in str(msg) for msg in messages))
+        assert_message_contains(self, response, 'Invalid date or time format')
     
     def test_booking_past_date(self):
         """Test booking with past date"""
-        past_date = timezone.now() - timedelta(days=1)
+        past_date = self.NOW - timedelta(days=1)
         booking_date = past_date.strftime('%Y-%m-%d')
         booking_time = past_date.strftime('%H:%M')
         
-        response = self.client.post(reverse('book'), {
+        response = self.client.post(BOOK_URL, {
             'name': 'John Doe',
             'no_of_guests': '4',
             'booking_date': booking_date,
@@ -334,19 +334,19 @@ class BookingViewTest(TestCase):
         
         # Should redirect back with error
         self.assertEqual(response.status_code, 302)
-        self.assertRedirects(response, reverse('book'))
+        self.assertRedirects(response, BOOK_URL, fetch_redirect_response=False)
         
         # Should not create booking
-        self.assertEqual(Booking.objects.filter(user=self.user).count(), 0)
+        self.assertFalse(Booking.objects.filter(user=self.user).exists())
 
 
 class LogoutViewTest(TestCase):
     """Test logout functionality"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = Client()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class"""
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
@@ -355,57 +355,60 @@ class LogoutViewTest(TestCase):
     def test_logout_authenticated_user(self):
         """Test logout for authenticated user"""
         # Login first
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # GET request should show logout confirmation
-        response = self.client.get(reverse('logout'))
+        response = self.client.get(LOGOUT_URL)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'logout.html')
     
     def test_logout_post_request(self):
         """Test logout POST request"""
         # Login first
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # POST request should logout and redirect
-        response = self.client.post(reverse('logout'))
+        response = self.client.post(LOGOUT_URL)
         self.assertEqual(response.status_code, 302)
-        self.assertRedirects(response, reverse('home'))
+        self.assertRedirects(response, HOME_URL, fetch_redirect_response=False)
         
         # Check success message
-        messages = list(get_messages(response.wsgi_request))
-        self.assertTrue(any('logged out successfully' in str(msg) for msg in messages))
+        assert_message_contains(self, response, 'logged out successfully')
     
     def test_logout_unauthenticated_user(self):
         """Test logout for unauthenticated user"""
-        response = self.client.get(reverse('logout'))
+        response = self.client.get(LOGOUT_URL)
         self.assertEqual(response.status_code, 302)
-        self.assertRedirects(response, reverse('login'))
+        self.assertRedirects(response, LOGIN_URL, fetch_redirect_response=False)
 
 
 class TemplateContextTest(TestCase):
     """Test template context data"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = Client()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class"""
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
         )
-        self.client.login(username='testuser', password='testpass123')
+        cls.NOW = timezone.now()
+    
+    def setUp(self):
+        """Set up per-test state"""
+        self.client.force_login(self.user)
     
     def test_menu_context_data(self):
         """Test menu view context data"""
         # Create menu items
-        menu_items = [
-            Menu.objects.create(title="Item 1", price=10.99, inventory=5),
-            Menu.objects.create(title="Item 2", price=15.99, inventory=0),  # Out of stock
-            Menu.objects.create(title="Item 3", price=12.99, inventory=10)
-        ]
+        Menu.objects.bulk_create([
+            Menu(title="Item 1", price=10.99, inventory=5),
+            Menu(title="Item 2", price=15.99, inventory=0),  # Out of stock
+            Menu(title="Item 3", price=12.99, inventory=10)
+        ])
         
-        response = self.client.get(reverse('menu'))
+        response = self.client.get(MENU_URL)
         self.assertEqual(response.status_code, 200)
         
         context_menu_items = response.context['menu_items']
@@ -420,8 +423,8 @@ class TemplateContextTest(TestCase):
     def test_my_bookings_context_data(self):
         """Test my bookings view context data"""
         # Create bookings
-        future_date1 = timezone.now() + timedelta(days=5)
-        future_date2 = timezone.now() + timedelta(days=10)
+        future_date1 = self.NOW + timedelta(days=5)
+        future_date2 = self.NOW + timedelta(days=10)
         
         booking1 = Booking.objects.create(
             user=self.user,
@@ -437,7 +440,7 @@ class TemplateContextTest(TestCase):
             booking_date=future_date2
         )
         
-        response = self.client.get(reverse('my-bookings'))
+        response = self.client.get(MY_BOOKINGS_URL)
         self.assertEqual(response.status_code, 200)
         
         # Check context data
@@ -454,16 +457,16 @@ class TemplateContextTest(TestCase):
 class ViewPermissionsTest(TestCase):
     """Test view permissions and access control"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = Client()
-        self.regular_user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class"""
+        cls.regular_user = User.objects.create_user(
             username='regular',
             email='regular@example.com',
             password='pass123'
         )
         
-        self.staff_user = User.objects.create_user(
+        cls.staff_user = User.objects.create_user(
             username='staff',
             email='staff@example.com',
             password='pass123',
@@ -472,33 +475,34 @@ class ViewPermissionsTest(TestCase):
     
     def test_regular_user_access(self):
         """Test regular user access to views"""
-        self.client.login(username='regular', password='pass123')
+        self.client.force_login(self.regular_user)
         
         # Should have access to these views
-        accessible_views = ['home', 'about', 'menu', 'book', 'my-bookings', 'logout']
+        accessible_views = [
+            ('home', HOME_URL), ('about', ABOUT_URL), ('menu', MENU_URL),
+            ('book', BOOK_URL), ('my-bookings', MY_BOOKINGS_URL), ('logout', LOGOUT_URL),
+        ]
         
-        for view_name in accessible_views:
-            response = self.client.get(reverse(view_name))
-            self.assertIn(response.status_code, [200, 302], f"Failed for {view_name}")
+        for view_name, url in accessible_views:
+            with self.subTest(view=view_name):
+                response = self.client.get(url)
+                self.assertIn(response.status_code, (200, 302))
     
     def test_anonymous_user_restrictions(self):
         """Test anonymous user restrictions"""
         # Should redirect to login for protected views
-        protected_views = ['menu', 'book', 'my-bookings']
+        protected_views = [('menu', MENU_URL), ('book', BOOK_URL), ('my-bookings', MY_BOOKINGS_URL)]
         
-        for view_name in protected_views:
-            response = self.client.get(reverse(view_name))
-            self.assertEqual(response.status_code, 302, f"Failed for {view_name}")
-            self.assertTrue(response.url.startswith('/login/'), f"Failed redirect for {view_name}")
+        for view_name, url in protected_views:
+            with self.subTest(view=view_name):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 302)
+                self.assertTrue(response.url.startswith(LOGIN_URL))
 
 
 class ResponseTest(TestCase):
     """Test HTTP responses and status codes"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = Client()
-    
     def test_404_handling(self):
         """Test 404 error handling"""
         response = self.client.get('/nonexistent-page/')
@@ -507,5 +511,5 @@ class ResponseTest(TestCase):
     def test_method_not_allowed(self):
         """Test method not allowed responses"""
         # Try DELETE on a view that doesn't support it
-        response = self.client.delete(reverse('home'))
+        response = self.client.delete(HOME_URL)
         self.assertEqual(response.status_code, 405)  # Method Not Allowed
\ No newline at end of file